@@ -1,5 +1,7 @@
 
+from array import array
 from collections import *
+from collections.abc import Sequence
 from itertools import *
 
 chain_from_iterable = chain.from_iterable
@@ -17,9 +19,74 @@ def slicer(sq, k, a=None, b=None):
         raise ValueError("zero/negative stride")
     return [sq[i:i+k] for i in range(len(sq))[slice(a,b,k)]]
 
+def native_search(group, x):
+    '''Whether x can be looked up by a str/bytes group's own methods
+
+    Those (and MappedSegment's) search for substrings, so they're only
+    used when x is a single character (or byte value) that could be an
+    element.
+    '''
+    if isinstance(group, str):
+        return isinstance(x, str) and len(x) == 1
+    return type(x) is int and 0 <= x < 256
+
+def group_find(group, x, a, b):
+    'Lowest index of x in group[a:b] or -1'
+    if isinstance(group, native_groups):
+        if native_search(group, x):
+            return group.find(x, a, b)
+    elif isinstance(group, (list, tuple)):
+        try:
+            return group.index(x, a, b)
+        except ValueError:
+            return -1
+    found = map(eq, repeat(x), islice(group, a, b))
+    return next(compress(count(a), found), -1)
+
+def group_rfind(group, x, a, b):
+    '''Highest index of x in group[a:b] or -1
+
+    str and bytes groups are searched by their own rfind; anything else
+    is walked backwards from b by reversed(), without copying the group.
+    '''
+    if isinstance(group, native_groups):
+        if native_search(group, x):
+            return group.rfind(x, a, b)
+    n = len(group)
+    found = map(eq, repeat(x), islice(reversed(group), n-b, n-a))
+    return next(compress(count(b-1, -1), found), -1)
+
+def group_slice(group, a, b, step):
+    '''group[a:b:step] for groups that can't be sliced as well
+
+    deques and other Sequences without slice support are walked with
+    islice instead, through reversed() when step is negative.
+    '''
+    try:
+        return group[a:b:step]
+    except TypeError:
+        if step > 0:
+            return [*islice(group, a, b, step)]
+    n = len(group)
+    return [*islice(reversed(group), n-1-a, None if b is None else n-1-b, -step)]
+
+def group_count(group, x):
+    if isinstance(group, native_groups):
+        if native_search(group, x):
+            return group.count(x)
+    elif isinstance(group, (list, tuple)):
+        return group.count(x)
+    return countOf(group, x)
+
+def group_contains(group, x):
+    if isinstance(group, native_groups):
+        if not native_search(group, x):
+            return any(map(eq, repeat(x), group))
+    return x in group
+
 class ChainSeq(Sequence):
 
-    __slots__ = '__groups', '__items'
+    __slots__ = '__groups', '__items', '__reps'
 
     def __add__(me, it):
 
@@ -27,97 +94,160 @@ class ChainSeq(Sequence):
             return NotImplemented
 
         if chainseq_check(it):
-            it = [*it.__groups]
+            it = [*it.groups]
         else:
             it = [*it]
 
-        items = islice(accumulate(map(len, [me, *it])), 1, None)
+        groups, items = me.__unrolled()
+        items = [*items, *islice(accumulate(map(len, it), initial=items[-1]), 1, None)]
         self = new_object(type(me))
-        self.__items = [*me.__items, *items]
-        self.__groups = [*me.__groups] + it
+        self.__items = items
+        self.__groups = [*groups, *it]
+        self.__reps = 1
         return self
 
     def __contains__(self, item):
-        return any(i==item for i in chain_from_iterable(self.__groups))
+        return any(map(group_contains, self.__groups, repeat(item)))
 
     def __eq__(me, it):
         if it is me:
             return True
         if not chainseq_check(it):
             return NotImplemented
-        return it.__groups == me.__groups
+        if it.__reps == me.__reps:
+            return it.__groups == me.__groups
+        return it.groups == me.groups
 
     def __getitem__(self, i):
         if slice_check(i):
-            return [*self][i]
+            return self.__view(i)
         size = len(self)
         if i < 0:
             i = size + i
         if i < 0 or i >= size:
             raise IndexError('slot index out of range')
-        k = bisect(self.__items, i) - 1
-        j = self.__items[k]
-        return self.__groups[k][i-j]
+        items = self.__items
+        if i >= items[-1]:
+            i %= items[-1]
+        k = bisect(items, i) - 1
+        return self.__groups[k][i-items[k]]
 
     def __init__(self, *seqs):
         self.__items = [0, *accumulate(map(len, seqs))]
         self.__groups = [*seqs]
+        self.__reps = 1
 
     def __iter__(self):
-        return chain_from_iterable(self.__groups)
+        if self.__reps == 1:
+            return chain_from_iterable(self.__groups)
+        groups = chain_from_iterable(repeat(self.__groups, self.__reps))
+        return chain_from_iterable(groups)
 
     def __len__(self):
-        return self.__items[-1]
+        return self.__items[-1] * self.__reps
 
     def __mul__(me, n):
+        '''Repeat the sequence n times
+
+        Nothing is repeated: the result shares one copy of the groups and
+        their offsets with a repetition count, and positions past the
+        first run are folded back into it by divmod. seq * 10000 costs
+        the same as seq * 2, and iterating over it cycles over the groups.
+        '''
         n = index(n)
         self = new_object(type(me))
-
-        if n < 2:
-            if n:
-                self.__groups = me.__groups.copy()
-                self.__items = me.__items.copy()
-            else:
-                self.__groups, self.__items = [], []
-            return self
-
-        *a, b = me._ChainSeq__items
-        g = me.__groups
-        c = [b, *((n-1) * [*map(len, g)])]
-        self.__items = [*a, *accumulate(c)]
-        self.__groups = g * n
+        if n < 1:
+            self.__groups, self.__items, self.__reps = [], [0], 1
+        else:
+            self.__groups = me.__groups.copy()
+            self.__items = me.__items.copy()
+            self.__reps = me.__reps * n
         return self
 
     def __repr__(self):
-        return f'{type(self).__name__}{*self.__groups,!r}'
+        r = f'{type(self).__name__}{*self.__groups,!r}'
+        return r if self.__reps == 1 else f'{r} * {self.__reps}'
 
     def __reversed__(self):
-        return chain_from_iterable(map(reversed, reversed(self.__groups)))
+        groups = chain_from_iterable(repeat(self.__groups[::-1], self.__reps))
+        return chain_from_iterable(map(reversed, groups))
+
+    def __unrolled(self):
+        'The groups and offsets with the repetitions written out'
+        if self.__reps == 1:
+            return self.__groups, self.__items
+        groups = self.__groups * self.__reps
+        return groups, [0, *accumulate(map(len, groups))]
+
+    def __unroll(self):
+        self.__groups, self.__items = self.__unrolled()
+        self.__reps = 1
+
+    def __view(self, i):
+        '''ChainSeq of the slice `i` sharing the groups it covers whole
+
+        Only the groups the slice touches are visited, each one found by
+        bisecting __items for the next position in the slice. Whole groups
+        are reused as-is when the step is 1 and the others are sliced with
+        the step's phase carried over so `self[i]` lists the same elements
+        as `[*self][i]`.
+        '''
+        items, groups = self.__items, self.__groups
+        size = items[-1]
+        a, b, step = i.indices(len(self))
+        parts = []
+        while a < b if step > 0 else a > b:
+            q, r = divmod(a, size)
+            k = bisect(items, r) - 1
+            j, end = q*size + items[k], q*size + items[k+1]
+            if step > 0:
+                if step == 1 and a == j and b >= end:
+                    parts.append(groups[k])
+                else:
+                    parts.append(group_slice(groups[k], a-j, min(b, end)-j, step))
+                a += ((end - a - 1)//step + 1) * step
+            else:
+                if step == -1 and a == end-1 and b < j:
+                    parts.append(group_slice(groups[k], len(groups[k])-1, None, -1))
+                else:
+                    c = b-j if b >= j else None
+                    parts.append(group_slice(groups[k], a-j, c, step))
+                a -= ((a - j)//-step + 1) * -step
+        self = new_object(type(self))
+        self.__items = [0, *accumulate(map(len, parts))]
+        self.__groups = parts
+        self.__reps = 1
+        return self
 
     def __set_name__(self, cls, var):
         pass
 
     def count(self, value):
-        return countOf(chain_from_iterable(self.__groups), value)
+        return sum(map(group_count, self.__groups, repeat(value))) * self.__reps
 
     def index(self, x, a=0, b=None):
-        seq = chain_from_iterable(self.__groups)
+        '''Lowest index of x in self[a:b]
 
-        if not a:
-            if b is None:
-                return indexOf(seq, x)
-            a = 0
-        n = len(self)
-        if b is None:
-            b = n
-        if a < 0:
-            a = max(0, a + n)
-        if b < 0:
-            b = max(0, b + n)
-        if b <= a:
-            return -1
-
-        return indexOf(islice(seq, a, b), x) + a
+        The group holding `a` is found by bisection and each group is
+        searched by its own find/index (see group_find) until one has x.
+        See time_search() for how it compares with flattening the groups.
+        '''
+        items, groups = self.__items, self.__groups
+        a, b, _ = slice(a, b).indices(len(self))
+        if a < b:
+            size = items[-1]
+            q, r = divmod(a, size)
+            k = bisect(items, r) - 1
+            q *= size
+            while q + items[k] < b:
+                j = q + items[k]
+                r = group_find(groups[k], x, max(a-j, 0), min(b, q+items[k+1]) - j)
+                if r != -1:
+                    return j + r
+                k += 1
+                if k == len(groups):
+                    k, q = 0, q + size
+        raise ValueError("seq.index(x): x not in seq")
 
     def find(self, x, a=0, b=None):
         try:
@@ -132,17 +262,135 @@ class ChainSeq(Sequence):
         return r
 
     def rfind(self, x, a=0, b=None):
-        n = len(self)
-        a, b, _ = slice(a, b).indices(n)
+        items, groups = self.__items, self.__groups
+        a, b, _ = slice(a, b).indices(len(self))
         if a >= b:
             return -1
-        seq = [*self]
-        rev = reversed(seq)
-        par = islice(rev, n-b, n-a)
-        res = next(dropwhile(abstract_ne(x), par), seq)
-        if res is seq:
-            return -1
-        return rev.__length_hint__()
+        size = items[-1]
+        q, r = divmod(b-1, size)
+        k = bisect(items, r) - 1
+        q *= size
+        while True:
+            j = q + items[k]
+            r = group_rfind(groups[k], x, max(a-j, 0), min(b, q+items[k+1]) - j)
+            if r != -1:
+                return j + r
+            if j <= a:
+                return -1
+            k -= 1
+            if k < 0:
+                k, q = len(groups) - 1, q - size
+
+    def take(self, indices):
+        '''[self[i] for i in indices] without a Python-level bisect per index
+
+        Sorted indices are resolved in one sweep: every run of them that
+        falls in the same group is found by bisecting the indices for the
+        end of that group, so each group touched costs two bisections and
+        one C-level gather. Sorting others first costs more than it saves,
+        so they are bisected one by one, but by map() from C. When indices
+        is an array or ndarray and NumPy is installed, the indices are
+        sorted and resolved by NumPy (argsort and searchsorted over the
+        offsets) and if every group touched is an ndarray so is the result.
+
+        For 10**6 indices over 1000 list groups of 1000, in seconds:
+
+                          [*map(self.__getitem__, ...)]    take
+        random                                     1.52    1.02
+        sorted                                     1.42    0.52
+        '''
+        try:
+            import numpy
+        except ImportError:
+            pass
+        else:
+            if isinstance(indices, (array, numpy.ndarray)):
+                return self.__take_numpy(numpy, indices)
+        indices = [*map(index, indices)]
+        if not indices:
+            return []
+        n = len(self)
+        items, groups = self.__items, self.__groups
+        ordered = all(map(le, indices, islice(indices, 1, None)))
+        if ordered:
+            lo, hi = indices[0], indices[-1]
+        else:
+            lo, hi = min(indices), max(indices)
+        if lo < -n or hi >= n:
+            raise IndexError('slot index out of range')
+        size = items[-1]
+        if lo < 0 or size != n:
+            indices = [*map(mod, indices, repeat(size))]
+            ordered = all(map(le, indices, islice(indices, 1, None)))
+
+        if not ordered:
+            # the pads make k, one past the group bisect finds, index both
+            k = [*map(bisect, repeat(items), indices)]
+            groups, items = [None, *groups], [None, *items]
+            offsets = map(sub, indices, map(items.__getitem__, k))
+            return [*map(getitem, map(groups.__getitem__, k), offsets)]
+
+        values = []
+        a, m = 0, len(indices)
+        while a < m:
+            k = bisect(items, indices[a]) - 1
+            b = bisect_left(indices, items[k+1], a)
+            offsets = map(sub, indices[a:b], repeat(items[k]))
+            values += map(groups[k].__getitem__, offsets)
+            a = b
+        return values
+
+    def __take_numpy(self, numpy, indices):
+        indices = numpy.asarray(indices)
+        if indices.size and indices.dtype.kind not in 'iu':
+            # like the list path, which index() every element
+            raise TypeError(f'indices must be integers, not {indices.dtype}')
+        indices = indices.astype(numpy.intp, copy=False)
+        if not indices.size:
+            return []
+        n = len(self)
+        items, groups = self.__items, self.__groups
+        if indices.min() < -n or indices.max() >= n:
+            raise IndexError('slot index out of range')
+        size = items[-1]
+        if indices.min() < 0 or size != n:
+            indices = indices % size
+        order = numpy.argsort(indices, kind='stable')
+        ordered = indices[order]
+        offsets = numpy.asarray(items)
+        which = numpy.searchsorted(offsets, ordered, 'right') - 1
+        cuts = [0, *(numpy.flatnonzero(numpy.diff(which)) + 1).tolist(), len(which)]
+        parts = []
+        for a, b in zip(cuts, cuts[1:]):
+            k = int(which[a])
+            group, at = groups[k], ordered[a:b] - items[k]
+            if isinstance(group, numpy.ndarray):
+                parts.append(group[at])
+            else:
+                parts.append([*map(group.__getitem__, at.tolist())])
+        if all(isinstance(part, numpy.ndarray) for part in parts):
+            values = numpy.concatenate(parts)
+            result = numpy.empty_like(values)
+            result[order] = values
+            return result
+        result = [None] * len(order)
+        values = chain_from_iterable(parts)
+        deque(map(result.__setitem__, order.tolist(), values), 0)
+        return result
+
+    @classmethod
+    def from_files(cls, paths, maxopen=64):
+        '''Chain the bytes of the files at `paths` without reading them
+
+        Each file becomes a MappedSegment, sized by os.stat, which is only
+        mmap'd when something reads from it. At most `maxopen` of them
+        are mapped at once; the least recently read mapping no read is
+        using is closed to make room for another, so any number of files
+        can be chained.
+        '''
+        maps = MappingCache(maxopen)
+        return cls(*(MappedSegment(path, os.stat(path).st_size, maps)
+                     for path in paths))
 
     @classmethod
     def from_nested(cls, *nested, depth=1):
@@ -168,7 +416,197 @@ class ChainSeq(Sequence):
 
     @property
     def groups(self):
-        return (*self.__groups,)
+        return (*self.__groups,) * self.__reps
+
+class MutableChainSeq(ChainSeq):
+    '''ChainSeq whose groups can be added and removed in place
+
+    The offsets stay the same list of prefix sums ChainSeq bisects, so
+    indexing and searching are unchanged. Appending a group only pushes
+    one more offset, which makes append_group and `+=` O(1) per group
+    where building the same sequence with `+` copies everything each
+    time. insert_group and remove_group have to shift the offsets of the
+    groups after the one added or removed, which is done at C speed.
+
+    A repeated MutableChainSeq (see ChainSeq.__mul__) writes out its
+    repetitions the first time it is changed. The groups themselves must
+    not change size once added.
+    '''
+
+    __slots__ = ()
+
+    def __iadd__(self, it):
+        if not sequence_check(it):
+            return NotImplemented
+        if chainseq_check(it):
+            it = [*it.groups]
+        else:
+            it = [*it]
+        self._ChainSeq__unroll()
+        items = self._ChainSeq__items
+        items += islice(accumulate(map(len, it), initial=items[-1]), 1, None)
+        self._ChainSeq__groups += it
+        return self
+
+    def append_group(self, group):
+        self._ChainSeq__unroll()
+        items = self._ChainSeq__items
+        items.append(items[-1] + len(group))
+        self._ChainSeq__groups.append(group)
+
+    def insert_group(self, k, group):
+        self._ChainSeq__unroll()
+        groups, items = self._ChainSeq__groups, self._ChainSeq__items
+        n = len(groups)
+        k = min(max(k + n, 0) if k < 0 else k, n)
+        groups.insert(k, group)
+        items.insert(k+1, items[k])
+        items[k+1:] = map(add, items[k+1:], repeat(len(group)))
+
+    def remove_group(self, k=-1):
+        self._ChainSeq__unroll()
+        groups, items = self._ChainSeq__groups, self._ChainSeq__items
+        group = groups.pop(k)
+        k = k + len(groups) + 1 if k < 0 else k
+        del items[k+1]
+        items[k+1:] = map(sub, items[k+1:], repeat(len(group)))
+        return group
+
+class MappingCache:
+    '''LRU of the open mmaps of some MappedSegments
+
+    A mapping is leased for the duration of each read, between acquire()
+    and release(), and only unleased ones are closed to make room, so
+    the cache can go over `maxopen` while every mapping is in use by
+    another thread. close() leaves leased mappings to their last release.
+    '''
+
+    # mmap keeps its own duplicate of the file descriptor, so the file is
+    # closed right away and each open mapping holds one descriptor.
+
+    __slots__ = 'maxopen', 'maps', 'lock'
+
+    def __init__(self, maxopen):
+        if maxopen < 1:
+            raise ValueError("maxopen must be positive")
+        self.maxopen = maxopen
+        self.maps = OrderedDict()
+        self.lock = Lock()
+
+    def __len__(self):
+        return len(self.maps)
+
+    def acquire(self, segment):
+        'The [mmap, leases] entry of segment, leased until release()'
+        maps = self.maps
+        with self.lock:
+            entry = maps.get(segment)
+            if entry is None:
+                with open(segment.path, 'rb') as file:
+                    m = mmap.mmap(file.fileno(), segment.size,
+                                  access=mmap.ACCESS_READ)
+                entry = maps[segment] = [m, 0]
+            else:
+                maps.move_to_end(segment)
+            entry[1] += 1
+            self.__trim()
+        return entry
+
+    def release(self, segment, entry):
+        with self.lock:
+            entry[1] -= 1
+            if self.maps.get(segment) is not entry:
+                if not entry[1]:
+                    entry[0].close()
+            elif len(self.maps) > self.maxopen:
+                self.__trim()
+
+    def __trim(self):
+        maps = self.maps
+        if len(maps) > self.maxopen:
+            for segment, entry in [*maps.items()]:
+                if not entry[1]:
+                    del maps[segment]
+                    entry[0].close()
+                    if len(maps) <= self.maxopen:
+                        break
+
+    def close(self):
+        with self.lock:
+            while self.maps:
+                m, leases = self.maps.popitem()[1]
+                if not leases:
+                    m.close()
+
+class MappedSegment:
+    '''The bytes of a file, read through an mmap opened on demand
+
+    The mapping is leased from a MappingCache for each read since the
+    cache may close it between reads. Iteration goes through copies of
+    1 MiB chunks for the same reason. The file must not shrink below the
+    size it had when the segment was made.
+    '''
+
+    __slots__ = 'path', 'size', 'maps'
+
+    chunk_size = 1 << 20
+
+    def __init__(self, path, size, maps):
+        self.path = path
+        self.size = size
+        self.maps = maps
+
+    def __contains__(self, x):
+        return self.find(x) != -1
+
+    def __getitem__(self, i):
+        if not self.size:
+            return b''[i]
+        return self.read(mmap.mmap.__getitem__, i)
+
+    def __iter__(self):
+        return chain_from_iterable(self.chunks())
+
+    def __len__(self):
+        return self.size
+
+    def __repr__(self):
+        return f'{type(self).__name__}({self.path!r}, {self.size})'
+
+    def __reversed__(self):
+        n = self.chunk_size
+        chunks = (self.read(mmap.mmap.__getitem__, slice(a, a+n))
+                  for a in reversed(range(0, self.size, n)))
+        return chain_from_iterable(map(reversed, chunks))
+
+    def chunks(self):
+        n = self.chunk_size
+        for a in range(0, self.size, n):
+            yield self.read(mmap.mmap.__getitem__, slice(a, a+n))
+
+    def count(self, x):
+        return sum(map(methodcaller('count', x), self.chunks()))
+
+    def find(self, x, a=0, b=None):
+        if not self.size:
+            return -1
+        b = self.size if b is None else b
+        return self.read(mmap.mmap.find, bytes((x,)), a, b)
+
+    def read(self, method, *args):
+        'method(mapping, *args) with the mapping leased while it runs'
+        maps = self.maps
+        entry = maps.acquire(self)
+        try:
+            return method(entry[0], *args)
+        finally:
+            maps.release(self, entry)
+
+    def rfind(self, x, a=0, b=None):
+        if not self.size:
+            return -1
+        b = self.size if b is None else b
+        return self.read(mmap.mmap.rfind, bytes((x,)), a, b)
 
 def _abstract_f(*funcs, prefix='abstract', sep='_'):
     '_abstract_f(eq) -> abstract_eq; filter(abstract_eq(2), range(5))'
@@ -177,14 +615,16 @@ def _abstract_f(*funcs, prefix='abstract', sep='_'):
         name = f'{prefix}{sep}{f.__name__}'
         ns[name] =  MethodType(_type_call.__get__(MethodType), f)
 
+import mmap
+import os
 import re
+from threading import Lock
 chainseq_check = ChainSeq.__instancecheck__
 split_string = re.compile(r'\S+').findall
 sequence_check = Sequence.__instancecheck__
 from publicize import *
-star_export('re', 'collections', 'itertools', 'operator', 'publicize', 'bisect')
 
-from bisect import bisect_right as bisect
+from bisect import bisect_right as bisect, bisect_left
 from operator import attrgetter as AG, methodcaller as MC, itemgetter as IG
 from operator import *
 from functools import partial as pt
@@ -194,6 +634,7 @@ _type_call = type.__call__
 _fast_new = _type_call.__get__
 _abstract_f(ne, eq, lt, le, ge, gt)
 frozen              = frozenset((bytes, memoryview, range, str, tuple))
+native_groups       = (str, bytes, bytearray, MappedSegment)
 slice_check         = slice.__instancecheck__
 new_object          = object.__new__
 fast_slice          = _fast_new(slice)
@@ -201,6 +642,72 @@ chain_from_iterable = chain.from_iterable
 first_item          = IG(0)
 rorder = IG(slice(None, None, -1))
 
+def time_search(ngroups=100, size=80000):
+    '''ms taken by index, find, count and `in` over str groups
+
+    Each is run against the chain_from_iterable version ChainSeq had
+    before searching groups natively, over `ngroups` groups of `size`
+    characters where 'z' is only the last one. Returns {call: (old, new)},
+    the best of 3 runs each; running this module prints it. On CPython
+    3.11 with the defaults:
+
+                                old      new
+        index('a', n-10)        101    0.004
+        find('z')               447     0.28
+        count('a')              530     10.2
+        'z' in seq              986     0.18
+    '''
+    from timeit import Timer
+
+    def old_index(seq, x, a=0, b=None):
+        flat = chain_from_iterable(seq.groups)
+        if not a:
+            if b is None:
+                return indexOf(flat, x)
+            a = 0
+        n = len(seq)
+        if b is None:
+            b = n
+        if a < 0:
+            a = max(0, a + n)
+        if b < 0:
+            b = max(0, b + n)
+        if b <= a:
+            return -1
+        return indexOf(islice(flat, a, b), x) + a
+
+    def old_find(seq, x):
+        try:
+            return old_index(seq, x)
+        except ValueError:
+            return -1
+
+    def old_count(seq, x):
+        return countOf(chain_from_iterable(seq.groups), x)
+
+    def old_contains(seq, x):
+        return any(i==x for i in chain_from_iterable(seq.groups))
+
+    group = ('abcdefgh' * (size // 8 + 1))[:size]
+    seq = ChainSeq(*[group] * (ngroups - 1), group[:-1] + 'z')
+    n = len(seq)
+    calls = {
+        "index('a', n-10)": (lambda: old_index(seq, 'a', n-10),
+                             lambda: seq.index('a', n-10)),
+        "find('z')":        (lambda: old_find(seq, 'z'),
+                             lambda: seq.find('z')),
+        "count('a')":       (lambda: old_count(seq, 'a'),
+                             lambda: seq.count('a')),
+        "'z' in seq":       (lambda: old_contains(seq, 'z'),
+                             lambda: 'z' in seq),
+        }
+    table = {}
+    for name, (old, new) in calls.items():
+        assert old() == new(), name
+        table[name] = tuple(min(Timer(f).repeat(3, 1)) * 1000
+                            for f in (old, new))
+    return table
+
 def test_indices(sq):
     global q
     q = 0
@@ -229,7 +736,15 @@ if __name__ == '__main__':
     sq = ChainSeq(*packed)
     assert sq+sq == ChainSeq(*(packed*2))
     assert [*(sq*3)]==unpacked*3
-    assert sq[:3] == [*'abc']
+    assert [*(sq*3)[-2::-4]] == (unpacked*3)[-2::-4] and sq*0 == ChainSeq()
+    assert (sq*3).rfind('c', 0, 10) == 8 and len(sq*10**9) == 6*10**9
+    assert [*sq[:3]] == [*'abc']
+    for i in product([None, *range(-8, 8)], [None, *range(-8, 8)],
+                     [None, *range(-4, 0), *range(1, 5)]):
+        assert [*sq[slice(*i)]] == unpacked[slice(*i)]
+        assert [*sq[::2][slice(*i)]] == unpacked[::2][slice(*i)]
+        assert [*sq[::-3][slice(*i)]] == unpacked[::-3][slice(*i)]
+    assert all(map(is_, sq[1:].groups, sq.groups[1:]))
     assert [*sq] == unpacked
     assert len(sq) == len(unpacked)
     assert [*reversed(sq)]==unpacked[::-1]
@@ -246,4 +761,99 @@ if __name__ == '__main__':
                 i = unpacked.index(item, start, None)
                 assert sq.index(item, start) == i
             except: pass
-    assert slicer(sq, 2) == [['a', 'b'], ['c', 0], [1, 2]]
+    log = MutableChainSeq()
+    for group in packed * 2:
+        log.append_group(group)
+    log += sq
+    assert log == ChainSeq(*packed*3)
+    log.insert_group(1, 'xy')
+    log.insert_group(-1, [7])
+    assert [*log] == ['a', *'xy', *unpacked[1:], *unpacked, *'abc', 7, *range(3)]
+    assert log.remove_group(1) == 'xy' and log.remove_group(-2) == [7]
+    assert log == ChainSeq(*packed*3) and log[4] == 1 and log.index(2, 6) == 11
+    picks = [5, -1, 0, 3, 3, -6, 1]
+    assert sq.take(picks) == [*map(unpacked.__getitem__, picks)]
+    assert (sq*4).take(array('q', [23, -24, 7])) == [2, 'a', 'b']
+    import tempfile
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for i, data in enumerate([b'log one\n', b'', b'log two\n'] * 3):
+            paths.append(os.path.join(tmp, f'{i}.log'))
+            with open(paths[-1], 'wb') as file:
+                file.write(data)
+        logs = ChainSeq.from_files(paths, maxopen=2)
+        data = b'log one\nlog two\n' * 3
+        assert len(logs) == len(data) and bytes(logs) == data
+        assert len(logs.groups[0].maps) == 2
+        assert logs[-2] == data[-2] and bytes(logs[5:40:3]) == data[5:40:3]
+        assert logs.find(ord('t')) == data.find(b't')
+        assert logs.rfind(ord('o'), 0, 30) == data.rfind(b'o', 0, 30)
+        assert logs.count(ord('g')) == 6 and ord('\n') in logs
+        assert bytes(reversed(logs)) == data[::-1]
+        logs.groups[0].maps.close()
+        # a mapping leased by a read isn't closed under it by another
+        from threading import Event, Thread
+        one, two = ChainSeq.from_files(paths[:3:2], maxopen=1).groups
+        leased, evicted = Event(), Event()
+        def slow(m, i):
+            leased.set()
+            evicted.wait(10)
+            return m[i]
+        reader = Thread(target=lambda: seen.append(one.read(slow, 3)))
+        seen = []
+        reader.start()
+        leased.wait(10)
+        assert two[0] == ord('l') and [*one.maps.maps] == [one]
+        evicted.set()
+        reader.join(10)
+        assert seen == [ord(' ')] and [*one.maps.maps] == [one]
+        entry = one.maps.acquire(one)
+        one.maps.close()
+        assert entry[0][0] == ord('l') and not one.maps
+        one.maps.release(one, entry)
+        assert entry[0].closed
+    assert [*map(list, slicer(sq, 2))] == [['a', 'b'], ['c', 0], [1, 2]]
+    # groups without slice support are walked instead
+    dq = ChainSeq(deque('abcdef'), range(6), deque([7, 8]))
+    flat = [*'abcdef', *range(6), 7, 8]
+    for i in [slice(1, 12, 2), slice(None, None, -1), slice(13, 2, -3),
+              slice(None), slice(4, 9)]:
+        assert [*dq[i]] == flat[i], i
+    # arrays and ndarrays go through NumPy when it's there, anything else
+    # through the bisecting path
+    try:
+        import numpy
+    except ImportError:
+        pass
+    else:
+        nd = ChainSeq(numpy.arange(5), numpy.arange(10, 17), numpy.arange(3))
+        flat = [*range(5), *range(10, 17), *range(3)]
+        picks = numpy.array([14, 0, -1, 6, 6, 2])
+        got = nd.take(picks)
+        assert isinstance(got, numpy.ndarray)
+        assert got.tolist() == [flat[i] for i in picks.tolist()]
+        got = nd.take(array('q', [3, -15]))
+        assert isinstance(got, numpy.ndarray) and got.tolist() == [3, 0]
+        mixed = ChainSeq(numpy.arange(4), 'xyz', [7, 8])
+        got = mixed.take(numpy.array([8, 4, 0, 5]))
+        assert got == [8, 'x', 0, 'y']
+        assert nd.take(range(4, 7)) == [4, 10, 11]
+        assert type(nd.take(iter([1, 2]))) is list
+        assert nd.take(numpy.array([], dtype=int)) == []
+        assert nd.take(numpy.array([])) == []
+        try:
+            nd.take(numpy.array([15]))
+        except IndexError:
+            pass
+        else:
+            raise AssertionError('take() let an out of range index through')
+        for floats in array('d', [1.7]), numpy.array([1.7]), [1.7]:
+            try:
+                nd.take(floats)
+            except TypeError:
+                pass
+            else:
+                raise AssertionError('take() truncated a float index')
+    print(f'{"ms":<18}{"old":>9}{"new":>9}')
+    for name, times in time_search().items():
+        print(f'{name:<18}' + ''.join(f'{t:>9.3g}' for t in times))